@@ -5,7 +5,10 @@ from solution_finder import *
 from scrambles import *
 from puzzle_generator import *
 from puzzle_drawer import *
+from repeated_shapes_tuner import *
 import datetime
+import time
+import numpy as np
 
 
 width = 5
@@ -15,14 +18,29 @@ maximum_repeated_shapes = 10
 V = generate_verification_matrix(width, height)
 
 
-def print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked):
+def print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked, maximum_repeated_shapes):
     print(f'\r{elapsed} - Tested {puzzle_count} puzzles. ', end='')
-    print(f'{duplicate_checked} had {maximum_repeated_shapes} or fewer repetitions of each connection shape, ', end='')
+    print(f'{duplicate_checked} passed the repeated shapes filter ', end='')
+    print(f'(currently at most {maximum_repeated_shapes} repetitions of each connection shape), ', end='')
     print(f'{solution_checked} of those had no duplicate pieces.', end='')
 
 
 # I'm putting the code inside a main function since this makes it easier to profile
-def main(max_time=-1):
+def main(max_time=-1, seed=None, tune_threshold=True, threshold_ceiling=None):
+    # Every random choice in the search is drawn from this generator, so the same seed gives the same search.
+    # If no seed is given, one is drawn and printed, so that a slow search can be replayed later
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    if len(seed.spawn_key) == 0:
+        print(f'Searching with seed {seed.entropy}')
+    else:
+        print(f'Searching with seed {seed.entropy}, worker {seed.spawn_key}')
+    rng = np.random.default_rng(seed)
+    # The repeated shapes threshold starts at the configured value, and is then tuned based on how the search goes,
+    # never going above threshold_ceiling if it is set. Tuning depends on how long each step takes, so turn it off to
+    # keep the threshold fixed and make a seeded search replay exactly
+    tuner = RepeatedShapesTuner(maximum_repeated_shapes, threshold_ceiling=threshold_ceiling)
+
     puzzle_count = 0
     duplicate_checked = 0
     solution_checked = 0
@@ -43,38 +61,50 @@ def main(max_time=-1):
 
         if elapsed.total_seconds() > seconds_elapsed:
             seconds_elapsed = elapsed.total_seconds()
-            print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked)
+            print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked, tuner.maximum_repeated_shapes)
+
+        decision = tuner.adjust() if tune_threshold else None
+        if decision is not None:
+            print()
+            print(decision)
 
+        generating_start = time.perf_counter()
         scramble = None
         scramble_similarity = 1
         while scramble_similarity > 0:
-            scramble = generate_random_scramble(width, height)
+            scramble = generate_random_scramble(width, height, rng)
             scramble_similarity = find_scramble_similarity(V, scramble)
         p = generate_solvable_puzzle(V, scramble)
+        # Build the compact form of the puzzle once, and share it between the filters and the solver
+        puzzle = Puzzle.from_vector(p)
         # Check how many of each connection type there is
 
-        repeated_shapes = get_number_of_repeated_shapes(p)
-        if max(repeated_shapes.values()) > maximum_repeated_shapes:
+        repeated_shapes = max(get_number_of_repeated_shapes(puzzle).values())
+        tuner.record_generated(repeated_shapes, time.perf_counter() - generating_start)
+        if not tuner.accepts(repeated_shapes):
             continue
 
         duplicate_checked += 1
 
-        if has_duplicate_pieces(p):
+        checking_start = time.perf_counter()
+        if has_duplicate_pieces(puzzle):
+            tuner.record_checked(repeated_shapes, True, None, time.perf_counter() - checking_start)
             continue
 
         solution_checked += 1
 
-        number = count_solutions(p, width, height)
+        number = count_solutions(puzzle, width, height)
+        tuner.record_checked(repeated_shapes, False, number, time.perf_counter() - checking_start)
         if number == 2:
-            puzzle_found = p
+            puzzle_found = puzzle
             scramble_found = scramble
             break
 
-    print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked)
+    print_progress(elapsed, puzzle_count, duplicate_checked, solution_checked, tuner.maximum_repeated_shapes)
     print()
     if puzzle_found is not None:
         print('Found solution with the following puzzle vector: ')
-        print(puzzle_found[:,0])
+        print(puzzle_found.to_vector()[:,0])
         display(draw_puzzle(puzzle_found, width, height, scramble_found))
     else:
         print('Timed out without finding solution')
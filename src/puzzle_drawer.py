@@ -75,7 +75,7 @@ def draw_puzzle(puzzle, width, height, scramble=None):
         3: (0, 40)
     }
 
-    for index, value in enumerate(puzzle[:, 0]):
+    for index, value in enumerate(puzzle.sides.flat):
         if value == 0:
             continue
         piece_number = index // 4
@@ -146,7 +146,7 @@ def draw_puzzle(puzzle, width, height, scramble=None):
         3: (0, 40)
     }
 
-    for index, value in enumerate((scramble @ puzzle)[:, 0]):
+    for index, value in enumerate((scramble @ puzzle.to_vector())[:, 0]):
         if value == 0:
             continue
         piece_number = index // 4
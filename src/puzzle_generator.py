@@ -48,12 +48,14 @@ def generate_solvable_puzzle(verification_matrix: np.array, scramble_matrix: np.
 
     # Pick a side that does not have a set shape, set an arbitrary shape,
     # set all other sides that are constrained by this.
-    # Repeat until no unset sides are left
+    # Repeat until no unset sides are left. The sides are visited in sorted order rather than set order, so that the
+    # shape numbering only depends on the scramble
     unset_sides = set(side for side in pairs)
     shape_number = 1
 
-    while len(unset_sides) > 0:
-        starting_side = unset_sides.pop()
+    for starting_side in sorted(pairs):
+        if starting_side not in unset_sides:
+            continue
         trial_solution[starting_side] = shape_number
         shape_number += 1
 
@@ -0,0 +1,148 @@
+from typing import Dict, Optional
+
+
+class ShapeRepetitionStatistics:
+    def __init__(self):
+        # How many candidates were generated with this maximum number of repeated shapes
+        self.generated = 0
+        # How many of those passed the repeated shapes filter, and were therefore checked further
+        self.checked = 0
+        # How many of the checked candidates had no duplicate pieces, and were sent to the solver
+        self.solved = 0
+        # The sum of 2 / number of solutions over the solved candidates. Every solved candidate has at least two
+        # solutions, so each one adds 1 if it is a puzzle we are looking for, and less the more symmetric it is
+        self.solution_score = 0.0
+        # Time spent checking for duplicate pieces and counting solutions for the checked candidates
+        self.checking_time = 0.0
+
+
+class RepeatedShapesTuner:
+    # Adjusts the maximum number of repeated shapes while searching, to get as close as possible to finding puzzles
+    # with only two solutions as quickly as possible. A loose threshold sends lots of symmetric puzzles to the solver,
+    # which is slow and rarely gives two solutions, while a tight threshold throws away most candidates, which wastes
+    # the time spent generating them
+    def __init__(self, maximum_repeated_shapes: int, adjustment_period: float = 10.0, minimum_solved: int = 5,
+                 threshold_ceiling: Optional[int] = None):
+        self.maximum_repeated_shapes = maximum_repeated_shapes
+        self.adjustment_period = adjustment_period
+        # A threshold is only compared with others once this many candidates with exactly that number of repeated
+        # shapes have been solved, so we don't make decisions based on a handful of candidates
+        self.minimum_solved = minimum_solved
+        # The threshold is never loosened beyond this, if it is set
+        self.threshold_ceiling = threshold_ceiling
+
+        self.statistics: Dict[int, ShapeRepetitionStatistics] = {}
+        self.generating_time = 0.0
+        self.time_since_adjustment = 0.0
+
+    def get_statistics(self, repeated_shapes: int) -> ShapeRepetitionStatistics:
+        statistics = self.statistics.get(repeated_shapes, None)
+        if statistics is None:
+            statistics = ShapeRepetitionStatistics()
+            self.statistics[repeated_shapes] = statistics
+        return statistics
+
+    def accepts(self, repeated_shapes: int) -> bool:
+        return repeated_shapes <= self.maximum_repeated_shapes
+
+    def record_generated(self, repeated_shapes: int, generating_time: float):
+        self.get_statistics(repeated_shapes).generated += 1
+        self.generating_time += generating_time
+        self.time_since_adjustment += generating_time
+
+    def record_checked(self, repeated_shapes: int, has_duplicates: bool, number_of_solutions: Optional[int],
+                       checking_time: float):
+        statistics = self.get_statistics(repeated_shapes)
+        statistics.checked += 1
+        statistics.checking_time += checking_time
+        if not has_duplicates:
+            statistics.solved += 1
+            statistics.solution_score += 2 / number_of_solutions
+        self.time_since_adjustment += checking_time
+
+    def estimate_score_per_second(self, maximum_repeated_shapes: int) -> Optional[float]:
+        # Estimate the solution score per second we would have got if we had always used this threshold. Candidates
+        # are generated the same way regardless of the threshold, so we only need to scale the cost and score of
+        # checking candidates with each number of repeated shapes by how many of them were generated.
+        # We can't estimate anything for a threshold that lets through candidates we have never checked
+        expected_score = 0.0
+        expected_time = self.generating_time
+        for repeated_shapes, statistics in self.statistics.items():
+            if repeated_shapes > maximum_repeated_shapes:
+                continue
+            if statistics.checked == 0:
+                return None
+            generated_per_checked = statistics.generated / statistics.checked
+            expected_score += generated_per_checked * statistics.solution_score
+            expected_time += generated_per_checked * statistics.checking_time
+
+        if expected_time == 0:
+            return None
+        return expected_score / expected_time
+
+    def get_estimates(self) -> Dict[int, float]:
+        # Estimate the score for each threshold where enough candidates with that number of repeated shapes have
+        # been solved
+        estimates = {}
+        for threshold in sorted(self.statistics):
+            if self.threshold_ceiling is not None and threshold > self.threshold_ceiling:
+                break
+            estimate = self.estimate_score_per_second(threshold)
+            if estimate is None:
+                break
+            if self.statistics[threshold].solved >= self.minimum_solved:
+                estimates[threshold] = estimate
+        return estimates
+
+    def adjust(self) -> Optional[str]:
+        # Returns a description of the decision if the threshold was changed, so that it can be logged
+        if self.time_since_adjustment < self.adjustment_period:
+            return None
+        self.time_since_adjustment = 0.0
+
+        current_threshold = self.maximum_repeated_shapes
+        looser_thresholds = [threshold for threshold in self.statistics if threshold > current_threshold]
+        if self.threshold_ceiling is not None:
+            looser_thresholds = [threshold for threshold in looser_thresholds if threshold <= self.threshold_ceiling]
+
+        estimates = self.get_estimates()
+        comparable_thresholds = [threshold for threshold in estimates if threshold <= current_threshold]
+        if len(comparable_thresholds) == 0:
+            # Nothing we have let through so far can be compared. If the filter is rejecting almost every candidate we
+            # generate, it is too tight to ever tell us anything, so let some more through. Otherwise, we wait until
+            # enough of the candidates it lets through have been solved
+            checked = sum(
+                statistics.checked for threshold, statistics in self.statistics.items()
+                if threshold <= current_threshold
+            )
+            if checked >= self.minimum_solved or len(looser_thresholds) == 0:
+                return None
+            new_threshold = min(looser_thresholds)
+            self.maximum_repeated_shapes = new_threshold
+            return (f'Changed maximum repeated shapes from {current_threshold} to {new_threshold} (exploring a looser '
+                    f'threshold, not enough candidates solved to compare thresholds yet)')
+
+        # The current threshold is represented by the loosest threshold below it that can be compared
+        current_level = max(comparable_thresholds)
+
+        # Only move away from the current threshold if another one is strictly better
+        best_threshold = max(
+            estimates,
+            key=lambda threshold: (estimates[threshold], threshold == current_level)
+        )
+        best_estimate = estimates[best_threshold]
+        if best_threshold == current_level:
+            # The current threshold is the best, but if it is also the loosest one we can compare, something looser
+            # might be better still
+            if best_threshold < max(estimates) or len(looser_thresholds) == 0:
+                return None
+            new_threshold = min(looser_thresholds)
+            reason = 'exploring a looser threshold'
+        else:
+            new_threshold = best_threshold
+            reason = 'best estimated score'
+
+        self.maximum_repeated_shapes = new_threshold
+        return (f'Changed maximum repeated shapes from {current_threshold} to {new_threshold} ({reason}, estimated '
+                f'{best_estimate:.3g} solved candidates per second at {best_threshold}, each weighted by 2 / its '
+                f'number of solutions)')
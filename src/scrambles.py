@@ -1,6 +1,5 @@
-from typing import Tuple
+from typing import List, Optional, Tuple
 import numpy as np
-import random
 
 
 def categorize_position(width: int, height: int, x: int, y: int) -> Tuple[str, int]:
@@ -26,11 +25,22 @@ def categorize_position(width: int, height: int, x: int, y: int) -> Tuple[str, i
         return 'middle', 0
 
 
+def spawn_worker_seeds(seed, number_of_workers: int) -> List[np.random.SeedSequence]:
+    # Forked processes would share the state of a single generator, so give each worker its own independent stream.
+    # Passing worker number i's seed to main() replays exactly what that worker did
+    return np.random.SeedSequence(seed).spawn(number_of_workers)
+
+
 # Store already calculated rotation matrices, to save on computation
 rotation_matrices = {}
 
 
-def generate_random_scramble(width: int, height: int) -> np.array:
+def generate_random_scramble(width: int, height: int, rng: Optional[np.random.Generator] = None) -> np.array:
+    # All randomness comes from the given generator, so that a search can be replayed exactly from its seed.
+    # Without one, we fall back to a freshly seeded generator
+    if rng is None:
+        rng = np.random.default_rng()
+
     number_of_sides = 4 * width * height
     scramble = np.zeros((number_of_sides, number_of_sides), np.int16)
 
@@ -49,9 +59,9 @@ def generate_random_scramble(width: int, height: int) -> np.array:
             elif category == 'middle':
                 middles.append(piece_number)
 
-    random.shuffle(corners)
-    random.shuffle(edges)
-    random.shuffle(middles)
+    rng.shuffle(corners)
+    rng.shuffle(edges)
+    rng.shuffle(middles)
 
     # Now fill in the puzzle
     for scrambled_x in range(width):
@@ -71,7 +81,7 @@ def generate_random_scramble(width: int, height: int) -> np.array:
 
             # If the piece is a middle piece, we can rotate it freely
             if category == 'middle':
-                rotation = random.randrange(4)
+                rotation = int(rng.integers(4))
 
             rotation_matrix = rotation_matrices.get(rotation, None)
             if rotation_matrix is None:
@@ -1,40 +1,105 @@
-from typing import List, Dict, Tuple, Dict
+from typing import List, Dict, Optional, Tuple, Dict
 import numpy as np
 
 
-def get_number_of_repeated_shapes(puzzle: np.array) -> Dict[int, int]:
-    connection_count = {}
-    for connection in puzzle[:,0]:
-        connection = int(connection)
-        if connection <= 0:
-            continue
-        if connection not in connection_count:
-            connection_count[connection] = 0
+# Rotating a piece counter-clockwise r times moves the shape on side s - r to side s. Indexing the sides of a piece
+# with row r of this table gives its sides after r rotations, in the same way as the rotation matrices in a scramble
+rotation_indices = np.array([[(side_number - rotation) % 4 for side_number in range(4)] for rotation in range(4)])
 
-        connection_count[connection] += 1
-    return connection_count
 
+def get_rotations(sides: np.array) -> np.array:
+    # Takes an array of shapes ending in (pieces, 4), and returns an array ending in (pieces, 4, 4), so that
+    # rotations[..., piece, rotation, side] is the shape on the given side of the piece when rotated
+    return sides[..., rotation_indices]
 
-def has_duplicate_pieces(puzzle: np.array) -> bool:
-    pieces = []
-    for i in range(0, len(puzzle), 4):
-        piece = (puzzle[i], puzzle[i + 1], puzzle[i + 2], puzzle[i + 3])
-        rotations = [(puzzle[i + j % 4], puzzle[i + (j + 1) % 4], puzzle[i + (j + 2) % 4], puzzle[i + (j + 3) % 4]) for
-                     j in range(4)]
-        for other_piece in pieces:
-            if other_piece in rotations:
-                return True
-        pieces.append(piece)
-    return False
+
+def get_canonical_piece_keys(rotations: np.array) -> np.array:
+    # Give each piece a single number that is the same for all rotations of the piece, so that two pieces are
+    # duplicates if and only if their keys are equal. Each rotation is encoded as a number in base 2 * max_shape + 1,
+    # and the smallest of the four numbers is used as the key
+    max_shape = int(np.abs(rotations).max(initial=0))
+    base = 2 * max_shape + 1
+    keys = np.zeros(rotations.shape[:-1], np.int64)
+    for side_number in range(4):
+        keys = keys * base + (rotations[..., side_number].astype(np.int64) + max_shape)
+    return keys.min(axis=-1)
+
+
+class Puzzle:
+    # A puzzle stored as an (N, 4) array with the shapes of the left, top, right and bottom side of each piece,
+    # together with the shapes of each piece in all four rotations. This is the same memory layout as the (4N, 1)
+    # puzzle vector, so converting between the two does not copy anything
+    def __init__(self, sides: np.array, rotations: Optional[np.array] = None):
+        self.sides = sides
+        if rotations is None:
+            rotations = get_rotations(sides)
+        self.rotations = rotations
+
+    @classmethod
+    def from_vector(cls, puzzle_vector: np.array) -> 'Puzzle':
+        return cls(puzzle_vector.reshape(-1, 4))
+
+    def to_vector(self) -> np.array:
+        return self.sides.reshape(-1, 1)
+
+
+class PuzzleCollection:
+    # Many puzzles of the same size stored as one (M, N, 4) array, so that filters can be applied to all of them at
+    # once, and so that they can be saved and loaded without converting each puzzle
+    def __init__(self, sides: np.array):
+        self.sides = sides
+        self.rotations = get_rotations(sides)
+
+    @classmethod
+    def from_puzzles(cls, puzzles: list) -> 'PuzzleCollection':
+        return cls(np.stack([puzzle.sides for puzzle in puzzles]))
+
+    @classmethod
+    def load(cls, path: str) -> 'PuzzleCollection':
+        return cls(np.load(path))
+
+    def save(self, path: str):
+        np.save(path, self.sides)
+
+    def __len__(self) -> int:
+        return len(self.sides)
+
+    def __getitem__(self, index: int) -> Puzzle:
+        return Puzzle(self.sides[index], self.rotations[index])
+
+    def get_maximum_repeated_shapes(self) -> np.array:
+        # Count each positive shape in each puzzle. Offsetting the shapes of each puzzle by a different amount lets us
+        # count all of them with a single bincount
+        shapes = self.sides.reshape(len(self.sides), -1).astype(np.int64)
+        number_of_shapes = int(shapes.max(initial=0)) + 1
+        offsets = np.arange(len(self.sides))[:, np.newaxis] * number_of_shapes
+        counts = np.bincount((shapes + offsets)[shapes > 0], minlength=len(self.sides) * number_of_shapes)
+        return counts.reshape(len(self.sides), number_of_shapes).max(axis=1)
+
+    def has_duplicate_pieces(self) -> np.array:
+        keys = np.sort(get_canonical_piece_keys(self.rotations), axis=1)
+        return np.any(keys[:, 1:] == keys[:, :-1], axis=1)
+
+
+def get_number_of_repeated_shapes(puzzle: Puzzle) -> Dict[int, int]:
+    shapes, counts = np.unique(puzzle.sides[puzzle.sides > 0], return_counts=True)
+    return dict(zip(shapes.tolist(), counts.tolist()))
+
+
+def has_duplicate_pieces(puzzle: Puzzle) -> bool:
+    # Two pieces are duplicates if one of them can be rotated to look exactly like the other
+    keys = get_canonical_piece_keys(puzzle.rotations)
+    return len(np.unique(keys)) < len(keys)
 
 
 class PuzzlePiece:
-    def __init__(self, piece_number: int, connection_shapes: List[int]):
+    def __init__(self, piece_number: int, rotated_shapes: List[List[int]]):
         self.piece_number = piece_number
-        self.connection_shapes = connection_shapes
+        # The shapes of each side of the piece for each rotation, taken from the rotations of the puzzle
+        self.rotated_shapes = rotated_shapes
 
     def get_side_shape(self, side_number: int, rotation_number: int):
-        return self.connection_shapes[(side_number - rotation_number) % 4]
+        return self.rotated_shapes[rotation_number % 4][side_number]
 
 
 class PuzzleSolutionBuilder:
@@ -145,7 +210,7 @@ class PuzzleSolutionBuilder:
 
 
 def count_solutions(
-        puzzle: np.array,
+        puzzle: Puzzle,
         width: int,
         height: int
 ) -> int:
@@ -153,13 +218,14 @@ def count_solutions(
     # works. Keep a running tally of solutions until we are done
     number_of_solutions = 0
 
-    # Create pieces based on the puzzle input
+    # Create pieces based on the puzzle input. Converting the rotations to lists once up front keeps numpy out of the
+    # search itself
+    rotations = puzzle.rotations.tolist()
     pieces = []
     for x in range(width):
         for y in range(height):
             piece_number = y * width + x
-            side_shapes = [int(shape) for shape in puzzle[4 * piece_number:4 * piece_number + 4, 0]]
-            pieces.append(PuzzlePiece(piece_number, side_shapes))
+            pieces.append(PuzzlePiece(piece_number, rotations[piece_number]))
 
     # Create a map from a given shape to the pieces that have that shape
     shape_to_pieces_map = {}
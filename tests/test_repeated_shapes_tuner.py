@@ -0,0 +1,91 @@
+from repeated_shapes_tuner import RepeatedShapesTuner
+
+
+def record_candidates(tuner, repeated_shapes, generated, checked, generating_time, checking_time,
+                      number_of_solutions=4, has_duplicates=False):
+    for _ in range(generated):
+        tuner.record_generated(repeated_shapes, generating_time)
+    for _ in range(checked):
+        tuner.record_checked(repeated_shapes, has_duplicates, None if has_duplicates else number_of_solutions,
+                             checking_time)
+
+
+def test_tightens_when_repeated_shapes_are_expensive_to_solve():
+    tuner = RepeatedShapesTuner(12, adjustment_period=0)
+    record_candidates(tuner, 8, 1000, 1000, 0.0, 0.01)
+    record_candidates(tuner, 12, 10, 10, 0.0, 1.0)
+
+    assert tuner.adjust() is not None
+    assert tuner.maximum_repeated_shapes == 8
+
+
+def test_tightens_when_repeated_shapes_give_symmetric_puzzles():
+    tuner = RepeatedShapesTuner(12, adjustment_period=0)
+    record_candidates(tuner, 8, 1000, 1000, 0.0, 0.01, number_of_solutions=2)
+    record_candidates(tuner, 12, 1000, 1000, 0.0, 0.01, number_of_solutions=100)
+
+    assert tuner.adjust() is not None
+    assert tuner.maximum_repeated_shapes == 8
+
+
+def test_loosens_when_filter_rejects_most_candidates():
+    tuner = RepeatedShapesTuner(8, adjustment_period=0)
+    record_candidates(tuner, 8, 10, 10, 0.01, 0.01)
+    # These were all thrown away by the filter, so generating them was wasted
+    record_candidates(tuner, 9, 1000, 0, 0.01, 0.01)
+
+    assert tuner.adjust() is not None
+    assert tuner.maximum_repeated_shapes == 9
+
+    # Once it turns out they are cheap to solve, the looser threshold is kept
+    record_candidates(tuner, 9, 0, 10, 0.0, 0.01)
+    assert tuner.adjust() is None
+    assert tuner.maximum_repeated_shapes == 9
+
+
+def test_loosens_when_nothing_has_been_accepted():
+    tuner = RepeatedShapesTuner(3, adjustment_period=0)
+    for repeated_shapes in [7, 8, 9]:
+        record_candidates(tuner, repeated_shapes, 1000, 0, 0.01, 0.0)
+
+    assert tuner.adjust() is not None
+    assert tuner.maximum_repeated_shapes == 7
+
+
+def test_does_not_loosen_beyond_ceiling():
+    tuner = RepeatedShapesTuner(3, adjustment_period=0, threshold_ceiling=6)
+    for repeated_shapes in [7, 8, 9]:
+        record_candidates(tuner, repeated_shapes, 1000, 0, 0.01, 0.0)
+
+    assert tuner.adjust() is None
+    assert tuner.maximum_repeated_shapes == 3
+
+
+def test_keeps_threshold_without_enough_solved_candidates():
+    tuner = RepeatedShapesTuner(10, adjustment_period=0)
+    # Plenty of candidates were let through, but hardly any of them reached the solver
+    record_candidates(tuner, 8, 100, 100, 0.01, 0.001, has_duplicates=True)
+    record_candidates(tuner, 10, 100, 100, 0.01, 0.001, has_duplicates=True)
+    record_candidates(tuner, 10, 1, 1, 0.01, 1.0)
+
+    assert tuner.adjust() is None
+    assert tuner.maximum_repeated_shapes == 10
+
+
+def test_keeps_threshold_when_estimates_are_tied():
+    tuner = RepeatedShapesTuner(10, adjustment_period=0)
+    record_candidates(tuner, 8, 100, 100, 0.0, 0.25)
+    record_candidates(tuner, 10, 100, 100, 0.0, 0.25)
+
+    assert tuner.get_estimates()[8] == tuner.get_estimates()[10]
+    assert tuner.adjust() is None
+    assert tuner.maximum_repeated_shapes == 10
+
+
+def test_waits_for_adjustment_period():
+    tuner = RepeatedShapesTuner(12, adjustment_period=100)
+    record_candidates(tuner, 8, 1000, 1000, 0.0, 0.01)
+    record_candidates(tuner, 12, 10, 10, 0.0, 1.0)
+
+    assert tuner.adjust() is None
+    assert tuner.maximum_repeated_shapes == 12
@@ -0,0 +1,22 @@
+import numpy as np
+
+from scrambles import generate_random_scramble, spawn_worker_seeds
+
+
+def generate_scrambles(seed, number_of_scrambles=10):
+    rng = np.random.default_rng(seed)
+    return [generate_random_scramble(4, 4, rng) for _ in range(number_of_scrambles)]
+
+
+def test_same_seed_gives_same_scrambles():
+    first_seed, = spawn_worker_seeds(1234, 1)
+    second_seed, = spawn_worker_seeds(1234, 1)
+    for first, second in zip(generate_scrambles(first_seed), generate_scrambles(second_seed)):
+        assert np.array_equal(first, second)
+
+
+def test_spawned_seeds_give_different_scrambles():
+    first_seed, second_seed = spawn_worker_seeds(1234, 2)
+    first_scrambles = generate_scrambles(first_seed)
+    second_scrambles = generate_scrambles(second_seed)
+    assert any(not np.array_equal(first, second) for first, second in zip(first_scrambles, second_scrambles))
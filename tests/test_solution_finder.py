@@ -0,0 +1,46 @@
+import numpy as np
+
+from verification_matrix import generate_verification_matrix
+from scrambles import generate_random_scramble
+from puzzle_generator import generate_solvable_puzzle
+from solution_finder import Puzzle, PuzzleCollection, get_number_of_repeated_shapes, has_duplicate_pieces
+
+
+def generate_puzzles(width, height, number_of_puzzles, seed=0):
+    rng = np.random.default_rng(seed)
+    verification_matrix = generate_verification_matrix(width, height)
+    return [
+        Puzzle.from_vector(generate_solvable_puzzle(verification_matrix, generate_random_scramble(width, height, rng)))
+        for _ in range(number_of_puzzles)
+    ]
+
+
+def test_puzzle_shares_memory_with_vector():
+    verification_matrix = generate_verification_matrix(3, 3)
+    puzzle_vector = generate_solvable_puzzle(verification_matrix, generate_random_scramble(3, 3))
+    puzzle = Puzzle.from_vector(puzzle_vector)
+    assert np.shares_memory(puzzle.sides, puzzle_vector)
+    assert np.array_equal(puzzle.to_vector(), puzzle_vector)
+
+
+def test_collection_filters_match_single_puzzle_filters():
+    puzzles = generate_puzzles(4, 4, 50)
+    collection = PuzzleCollection.from_puzzles(puzzles)
+
+    expected_repeated_shapes = [max(get_number_of_repeated_shapes(puzzle).values()) for puzzle in puzzles]
+    expected_duplicates = [has_duplicate_pieces(puzzle) for puzzle in puzzles]
+    assert collection.get_maximum_repeated_shapes().tolist() == expected_repeated_shapes
+    assert collection.has_duplicate_pieces().tolist() == expected_duplicates
+    # Make sure both outcomes of the duplicate filter were covered
+    assert any(expected_duplicates) and not all(expected_duplicates)
+
+
+def test_collection_save_and_load(tmp_path):
+    collection = PuzzleCollection.from_puzzles(generate_puzzles(3, 3, 10))
+    path = tmp_path / 'puzzles.npy'
+    collection.save(path)
+
+    loaded = PuzzleCollection.load(path)
+    assert loaded.sides.dtype == collection.sides.dtype
+    assert np.array_equal(loaded.sides, collection.sides)
+    assert np.array_equal(loaded[3].rotations, collection[3].rotations)